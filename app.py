@@ -12,15 +12,22 @@ Production Enhancements:
 - Improved user feedback
 """
 
+import io
+from collections import deque
 import streamlit as st
-import matplotlib.pyplot as plt
-import networkx as nx
+import numpy as np
 from typing import Optional, List, Tuple, Dict
 from datetime import datetime
-from data_loader import get_road_network, get_locations, get_edge_list, update_traffic_weight
-from utils import dijkstra_shortest_path, get_path_edges, format_path_display
+from data_loader import (
+    RoadNetworkCSR, get_road_network, get_locations, build_csr, edge_list_from_csr,
+    network_fingerprint, update_traffic_weight
+)
+from utils import all_pairs_dijkstra, lookup_route, format_path_display
 import time
 
+# matplotlib, networkx and layout (which pulls in networkx) are imported inside
+# the functions that use them, so they are only loaded once the graph is built
+
 
 # Page configuration
 st.set_page_config(
@@ -30,6 +37,14 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Cached functions hash the road network by content, so traffic edits
+# invalidate every cached result automatically
+NETWORK_HASH_FUNCS = {dict: network_fingerprint}
+
+# Caches are shared by all sessions, so only the most recent network
+# versions are kept
+NETWORK_CACHE_ENTRIES = 16
+
 
 def initialize_session_state():
     """Initialize session state variables for the app."""
@@ -37,36 +52,250 @@ def initialize_session_state():
         st.session_state.road_network = get_road_network()
     if 'show_traffic_editor' not in st.session_state:
         st.session_state.show_traffic_editor = False
-    if 'graph_cache_key' not in st.session_state:
-        st.session_state.graph_cache_key = 0
     if 'route_history' not in st.session_state:
-        st.session_state.route_history = []
+        # Bounded to the last 10 routes; older entries are evicted automatically
+        st.session_state.route_history = deque(maxlen=10)
     if 'calculation_time' not in st.session_state:
         st.session_state.calculation_time = 0
+    if 'fig' not in st.session_state:
+        # Reused network figure, created on first draw (see _session_figure)
+        st.session_state.fig = None
+        st.session_state.ax = None
+        st.session_state.fig_network = None
 
 
-@st.cache_data
-def create_networkx_graph(_road_network: Dict, _cache_key: int):
+@st.cache_resource(hash_funcs=NETWORK_HASH_FUNCS, max_entries=NETWORK_CACHE_ENTRIES)
+def get_networkx_graph(road_network: Dict):
     """
     Creates a NetworkX graph from the road network (cached for performance).
     
+    The graph is a shared resource returned by reference, so callers must not
+    mutate it.
+    
     Args:
-        _road_network: Dictionary representing the road network
-        _cache_key: Cache invalidation key (changes when traffic updates)
+        road_network: Dictionary representing the road network
         
     Returns:
         NetworkX Graph object
     """
+    import networkx as nx
+    
+    network_csr = get_csr_graph(road_network)
+    nodes = network_csr.nodes
+    
+    # Roads are bidirectional, so an undirected graph with one edge per road
     G = nx.Graph()
-    for source, neighbors in _road_network.items():
-        for destination, weight in neighbors.items():
-            G.add_edge(source, destination, weight=weight)
+    G.add_nodes_from(nodes)
+    G.add_weighted_edges_from(
+        (nodes[src], nodes[dst], weight)
+        for src, dst, weight in zip(
+            network_csr.edge_src.tolist(),
+            network_csr.edge_dst.tolist(),
+            network_csr.edge_weights.tolist()
+        )
+    )
     return G
 
 
+@st.cache_data(hash_funcs=NETWORK_HASH_FUNCS, max_entries=NETWORK_CACHE_ENTRIES)
+def compute_spring_layout(road_network: Dict) -> Dict:
+    """
+    Computes node positions for the road network graph (cached for performance).
+    
+    The layout only depends on the graph's topology and weights, so it is reused
+    across reruns until the traffic changes.
+    
+    Args:
+        road_network: Dictionary representing the road network
+        
+    Returns:
+        Dictionary mapping each node to its (x, y) position
+    """
+    import networkx as nx
+    
+    return nx.spring_layout(get_networkx_graph(road_network), k=2, iterations=50, seed=42)
+
+
+@st.cache_data(hash_funcs=NETWORK_HASH_FUNCS, max_entries=NETWORK_CACHE_ENTRIES)
+def get_csr_graph(road_network: Dict) -> RoadNetworkCSR:
+    """
+    Converts the road network into its CSR array representation (cached for performance).
+    
+    Args:
+        road_network: Dictionary representing the road network
+        
+    Returns:
+        RoadNetworkCSR bundle (see data_loader.build_csr)
+    """
+    return build_csr(road_network)
+
+
+@st.cache_data(hash_funcs=NETWORK_HASH_FUNCS, max_entries=NETWORK_CACHE_ENTRIES)
+def get_all_pairs_paths(road_network: Dict) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Precomputes shortest paths between all locations (cached for performance).
+    
+    Changing the source or destination then only needs an array lookup instead
+    of a new Dijkstra run.
+    
+    Args:
+        road_network: Dictionary representing the road network
+        
+    Returns:
+        tuple: (distance matrix, predecessor matrix), indexed like get_csr_graph
+    """
+    return all_pairs_dijkstra(get_csr_graph(road_network))
+
+
+@st.cache_data(hash_funcs=NETWORK_HASH_FUNCS, max_entries=NETWORK_CACHE_ENTRIES)
+def _cached_locations(road_network: Dict) -> List[str]:
+    """Returns the sorted location list for the current network (cached per network version)."""
+    return get_locations(road_network)
+
+
+@st.cache_data(hash_funcs=NETWORK_HASH_FUNCS, max_entries=NETWORK_CACHE_ENTRIES)
+def _cached_edges(road_network: Dict) -> Tuple[List[Tuple[str, str, float]], np.ndarray]:
+    """Returns the edge list and its weights array for the current network (cached per network version)."""
+    network_csr = get_csr_graph(road_network)
+    return edge_list_from_csr(network_csr), network_csr.edge_weights
+
+
+@st.cache_data(hash_funcs=NETWORK_HASH_FUNCS, max_entries=NETWORK_CACHE_ENTRIES)
+def edge_segment_array(road_network: Dict):
+    """
+    Computes the segment coordinates of every road once per layout (cached for performance).
+    
+    Args:
+        road_network: Dictionary representing the road network
+        
+    Returns:
+        tuple: (float32 array of shape (n_edges, 2, 2), (src, dst) -> edge index dict)
+               Edges are ordered like the RoadNetworkCSR edge arrays and can be
+               looked up in either direction
+    """
+    pos = compute_spring_layout(road_network)
+    network_csr = get_csr_graph(road_network)
+    idx_to_node = network_csr.nodes
+    
+    pos_arr = np.stack([pos[node] for node in idx_to_node]).astype(np.float32)
+    edge_coords = np.stack([pos_arr[network_csr.edge_src], pos_arr[network_csr.edge_dst]], axis=1)
+    
+    edge_index = {}
+    for idx, (u, v) in enumerate(zip(network_csr.edge_src.tolist(), network_csr.edge_dst.tolist())):
+        edge_index[(idx_to_node[u], idx_to_node[v])] = idx
+        edge_index[(idx_to_node[v], idx_to_node[u])] = idx
+    
+    return edge_coords, edge_index
+
+
+def _draw_network(ax, road_network: Dict):
+    """
+    Draws the static part of the network graph (nodes, gray roads and labels).
+    
+    Args:
+        ax: matplotlib Axes to draw into
+        road_network: Dictionary representing the road network
+    """
+    import networkx as nx
+    from matplotlib.collections import LineCollection
+    
+    G = get_networkx_graph(road_network)
+    
+    # Use spring layout for better visualization
+    pos = compute_spring_layout(road_network)
+    edge_coords, _ = edge_segment_array(road_network)
+    
+    # Draw all nodes
+    nx.draw_networkx_nodes(
+        G, pos, 
+        node_color='lightblue', 
+        node_size=2000,
+        alpha=0.9,
+        ax=ax
+    )
+    
+    # Draw all edges in gray
+    ax.add_collection(LineCollection(
+        edge_coords,
+        colors='gray',
+        linewidths=2,
+        alpha=0.5,
+        antialiased=False,
+        zorder=1
+    ))
+    # Pad the limits like nx.draw_networkx_edges so labels near the border fit
+    ax.margins(0.1)
+    ax.autoscale_view()
+    
+    # Draw node labels
+    nx.draw_networkx_labels(
+        G, pos,
+        font_size=9,
+        font_weight='bold',
+        font_color='darkblue',
+        ax=ax
+    )
+    
+    # Draw edge labels (weights) at the midpoint of each road
+    network_csr = get_csr_graph(road_network)
+    mid = edge_coords.mean(axis=1)
+    # Align each label with its road, kept upright like nx.draw_networkx_edge_labels
+    delta = edge_coords[:, 1] - edge_coords[:, 0]
+    angles = (np.degrees(np.arctan2(delta[:, 1], delta[:, 0])) + 90) % 180 - 90
+    for x, y, angle, w in zip(mid[:, 0], mid[:, 1], angles, network_csr.edge_weights):
+        ax.text(
+            x, y, f"{w:g}",
+            fontsize=8,
+            color='green',
+            ha='center',
+            va='center',
+            rotation=angle,
+            rotation_mode='anchor',
+            transform_rotates_text=True,
+            bbox=dict(boxstyle='round', ec='white', fc='white'),
+            clip_on=True
+        )
+    
+    ax.set_title("Road Network Graph (Weights = Travel Time in Minutes)", 
+                 fontsize=14, fontweight='bold', pad=20)
+    ax.axis('off')
+
+
+def _session_figure(road_network: Dict):
+    """
+    Returns this session's figure with the road network drawn on it.
+    
+    The Figure/Axes pair is created once per session and reused for every
+    render. The axes are only cleared and redrawn when the network changes,
+    otherwise just the highlighted route is swapped.
+    
+    Args:
+        road_network: Dictionary representing the road network
+        
+    Returns:
+        tuple: (figure, axes)
+    """
+    from matplotlib.figure import Figure
+    
+    if st.session_state.fig is None:
+        # 80 DPI is plenty for a schematic map and keeps the PNG small
+        st.session_state.fig = Figure(figsize=(14, 10), dpi=80)
+        st.session_state.ax = st.session_state.fig.subplots()
+        # Fixed margins instead of tight_layout's solver, leaving room for the title
+        st.session_state.fig.subplots_adjust(left=0, bottom=0, right=1, top=0.94)
+    
+    fingerprint = network_fingerprint(road_network)
+    if st.session_state.fig_network != fingerprint:
+        st.session_state.ax.clear()
+        _draw_network(st.session_state.ax, road_network)
+        st.session_state.fig_network = fingerprint
+    
+    return st.session_state.fig, st.session_state.ax
+
+
 def create_network_graph(road_network: Dict, highlight_path: Optional[List[Tuple]] = None):
     """
-    Creates a NetworkX graph from the road network and visualizes it.
+    Visualizes the road network, highlighting the given path.
     
     Args:
         road_network: Dictionary representing the road network
@@ -75,75 +304,39 @@ def create_network_graph(road_network: Dict, highlight_path: Optional[List[Tuple
     Returns:
         matplotlib figure object
     """
+    from matplotlib.collections import LineCollection
+    
     try:
-        # Create graph with cache key
-        G = create_networkx_graph(road_network, st.session_state.graph_cache_key)
+        # Create graph (cached per network version)
+        G = get_networkx_graph(road_network)
         
         if len(G.nodes()) == 0:
             st.error("No nodes found in the road network!")
             return None
         
-        # Set up the plot
-        fig, ax = plt.subplots(figsize=(14, 10))
-        
-        # Use spring layout for better visualization
-        pos = nx.spring_layout(G, k=2, iterations=50, seed=42)
-        
-        # Draw all nodes
-        nx.draw_networkx_nodes(
-            G, pos, 
-            node_color='lightblue', 
-            node_size=2000,
-            alpha=0.9,
-            ax=ax
-        )
+        fig, ax = _session_figure(road_network)
+        edge_coords, edge_index = edge_segment_array(road_network)
         
-        # Draw all edges in gray
-        nx.draw_networkx_edges(
-            G, pos,
-            edge_color='gray',
-            width=2,
-            alpha=0.5,
-            ax=ax
-        )
+        # Remove the previously highlighted path
+        for collection in list(ax.collections):
+            if collection.get_gid() == 'highlight':
+                collection.remove()
         
         # Highlight the shortest path if provided
         if highlight_path and len(highlight_path) > 0:
             # Filter valid edges
-            valid_edges = [e for e in highlight_path if G.has_edge(*e)]
-            if valid_edges:
-                nx.draw_networkx_edges(
-                    G, pos,
-                    edgelist=valid_edges,
-                    edge_color='red',
-                    width=4,
+            valid_idx = [edge_index[e] for e in highlight_path if e in edge_index]
+            if valid_idx:
+                highlight = LineCollection(
+                    edge_coords[valid_idx],
+                    colors='red',
+                    linewidths=4,
                     alpha=0.8,
-                    ax=ax
+                    antialiased=False,
+                    zorder=1
                 )
-        
-        # Draw node labels
-        nx.draw_networkx_labels(
-            G, pos,
-            font_size=9,
-            font_weight='bold',
-            font_color='darkblue',
-            ax=ax
-        )
-        
-        # Draw edge labels (weights)
-        edge_labels = nx.get_edge_attributes(G, 'weight')
-        nx.draw_networkx_edge_labels(
-            G, pos,
-            edge_labels,
-            font_size=8,
-            font_color='green',
-            ax=ax
-        )
-        
-        ax.set_title("Road Network Graph (Weights = Travel Time in Minutes)", 
-                     fontsize=14, fontweight='bold', pad=20)
-        ax.axis('off')
-        plt.tight_layout()
+                highlight.set_gid('highlight')
+                ax.add_collection(highlight, autolim=False)
         
         return fig
         
@@ -152,6 +345,33 @@ def create_network_graph(road_network: Dict, highlight_path: Optional[List[Tuple
         return None
 
 
+@st.cache_data(hash_funcs=NETWORK_HASH_FUNCS, max_entries=64)
+def _render_png(road_network: Dict, highlight_edges: Tuple[Tuple[str, str], ...]) -> bytes:
+    """
+    Renders the network graph to PNG bytes (cached for performance).
+    
+    Reruns triggered by unrelated widgets reuse the cached image instead of
+    redrawing the whole figure.
+    
+    Args:
+        road_network: Dictionary representing the road network
+        highlight_edges: Sorted tuple of edges to highlight (shortest path)
+        
+    Returns:
+        PNG image bytes
+        
+    Raises:
+        RuntimeError: If the graph could not be drawn (failures are not cached)
+    """
+    fig = create_network_graph(road_network, list(highlight_edges))
+    if fig is None:
+        raise RuntimeError("Could not draw the network graph")
+    
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png')
+    return buf.getvalue()
+
+
 def display_route_statistics(path: List[str], total_weight: float):
     """Display detailed route statistics."""
     if not path or len(path) < 2:
@@ -184,10 +404,8 @@ def add_to_route_history(source: str, destination: str, time: float, path: List[
         'path': path
     }
     
-    # Keep only last 10 entries
+    # Keep only last 10 entries (route_history is a bounded deque)
     st.session_state.route_history.append(history_entry)
-    if len(st.session_state.route_history) > 10:
-        st.session_state.route_history.pop(0)
 
 
 def display_sidebar():
@@ -197,23 +415,22 @@ def display_sidebar():
         
         # Network stats
         st.subheader("Network Statistics")
-        locations = get_locations()
-        edges = get_edge_list()
+        locations = _cached_locations(st.session_state.road_network)
+        edges, weights_arr = _cached_edges(st.session_state.road_network)
         
         st.metric("Total Locations", len(locations))
         st.metric("Total Routes", len(edges))
         
         # Calculate average traffic
         if edges:
-            avg_weight = sum(w for _, _, w in edges) / len(edges)
-            st.metric("Avg. Travel Time", f"{avg_weight:.1f} min")
+            st.metric("Avg. Travel Time", f"{weights_arr.mean():.1f} min")
         
         st.divider()
         
         # Route history
         st.subheader("🕐 Recent Routes")
         if st.session_state.route_history:
-            for idx, entry in enumerate(reversed(st.session_state.route_history[-5:])):
+            for idx, entry in enumerate(list(st.session_state.route_history)[-5:][::-1]):
                 with st.expander(f"{entry['timestamp']} - {entry['source'][:8]}... → {entry['destination'][:8]}..."):
                     st.write(f"**From:** {entry['source']}")
                     st.write(f"**To:** {entry['destination']}")
@@ -228,12 +445,14 @@ def display_sidebar():
         st.subheader("⚡ Quick Actions")
         if st.button("🔄 Reset All Traffic", use_container_width=True):
             st.session_state.road_network = get_road_network()
-            st.session_state.graph_cache_key += 1
+            # Drop edited values so the traffic editor shows the reset weights
+            for key in [k for k in st.session_state if k.startswith("edge_")]:
+                del st.session_state[key]
             st.success("All traffic reset!")
             st.rerun()
         
         if st.button("🗑️ Clear History", use_container_width=True):
-            st.session_state.route_history = []
+            st.session_state.route_history.clear()
             st.success("History cleared!")
             st.rerun()
 
@@ -265,7 +484,7 @@ def main():
             st.subheader("📍 Route Selection")
             
             # Get locations for dropdowns
-            locations = get_locations()
+            locations = _cached_locations(st.session_state.road_network)
             
             if not locations or len(locations) == 0:
                 st.error("No locations available in the road network!")
@@ -302,10 +521,18 @@ def main():
                             start_time = time.time()
                             
                             # Calculate shortest path
-                            path, total_weight = dijkstra_shortest_path(
-                                st.session_state.road_network,
-                                source,
-                                destination
+                            network_csr = get_csr_graph(
+                                st.session_state.road_network
+                            )
+                            dist_matrix, pred_matrix = get_all_pairs_paths(
+                                st.session_state.road_network
+                            )
+                            path, path_edges, total_weight = lookup_route(
+                                network_csr,
+                                dist_matrix,
+                                pred_matrix,
+                                network_csr.node_to_idx[source],
+                                network_csr.node_to_idx[destination]
                             )
                             
                             end_time = time.time()
@@ -314,7 +541,7 @@ def main():
                             # Store results in session state
                             st.session_state.current_path = path
                             st.session_state.current_weight = total_weight
-                            st.session_state.path_edges = get_path_edges(path) if path else None
+                            st.session_state.path_edges = path_edges
                             
                             # Add to history
                             if path:
@@ -356,11 +583,15 @@ def main():
             
             # Visualize the graph
             highlight_edges = st.session_state.get('path_edges', None)
-            fig = create_network_graph(st.session_state.road_network, highlight_edges)
-            
-            if fig:
-                st.pyplot(fig)
-                plt.close(fig)
+            try:
+                png_bytes = _render_png(
+                    st.session_state.road_network,
+                    tuple(sorted(highlight_edges)) if highlight_edges else ()
+                )
+                st.image(png_bytes)
+            except RuntimeError:
+                # create_network_graph has already shown the error
+                pass
             
             # Legend
             st.markdown("""
@@ -378,39 +609,50 @@ def main():
             st.info("Modify traffic conditions by updating edge weights. Higher values = more congestion.")
             
             # Get all edges
-            edges = get_edge_list()
+            edges, _ = _cached_edges(st.session_state.road_network)
             
             if not edges:
                 st.warning("No edges available to edit.")
                 return
             
-            # Create columns for edge editing
-            cols = st.columns(3)
-            
-            for idx, (src, dst, weight) in enumerate(edges):
-                with cols[idx % 3]:
-                    new_weight = st.number_input(
-                        f"{src} ↔ {dst}",
-                        min_value=1,
-                        max_value=100,
-                        value=int(weight),
-                        step=1,
-                        key=f"edge_{src}_{dst}",
-                        help=f"Current: {weight} min"
-                    )
+            # Edits are batched in a form so the app only reruns on "Apply"
+            with st.form("traffic_form"):
+                # Create columns for edge editing
+                cols = st.columns(3)
+                
+                for idx, (src, dst, weight) in enumerate(edges):
+                    with cols[idx % 3]:
+                        st.number_input(
+                            f"{src} ↔ {dst}",
+                            min_value=1,
+                            max_value=100,
+                            value=int(weight),
+                            step=1,
+                            key=f"edge_{src}_{dst}",
+                            help=f"Current: {weight:g} min"
+                        )
+                
+                if st.form_submit_button("Apply", type="primary", use_container_width=True):
+                    try:
+                        # Update only the edges whose weight changed
+                        updated = 0
+                        for src, dst, _ in edges:
+                            new_weight = st.session_state[f"edge_{src}_{dst}"]
+                            if new_weight != st.session_state.road_network[src][dst]:
+                                st.session_state.road_network = update_traffic_weight(
+                                    st.session_state.road_network,
+                                    src, dst, new_weight
+                                )
+                                updated += 1
+                        
+                        if updated:
+                            st.toast(f"Updated {updated} road(s)", icon="✅")
+                    except Exception as e:
+                        st.error(f"Error updating traffic: {str(e)}")
+                        updated = 0
                     
-                    # Update if changed
-                    if new_weight != weight:
-                        try:
-                            st.session_state.road_network = update_traffic_weight(
-                                st.session_state.road_network,
-                                src, dst, new_weight
-                            )
-                            # Invalidate cache
-                            st.session_state.graph_cache_key += 1
-                            st.toast(f"Updated {src} ↔ {dst} to {new_weight} min", icon="✅")
-                        except Exception as e:
-                            st.error(f"Error updating traffic: {str(e)}")
+                    if updated:
+                        st.rerun()
         
         # Footer
         st.divider()
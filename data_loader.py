@@ -4,6 +4,33 @@ Purpose: Contains predefined road network data with locations and traffic-weight
 This module provides the graph structure and location list for the traffic predictor.
 """
 
+import hashlib
+from typing import Dict, List, NamedTuple
+
+import numpy as np
+
+
+class RoadNetworkCSR(NamedTuple):
+    """
+    Compressed sparse row (CSR) view of the road network, stored as flat arrays.
+    
+    Neighbors of node i are indices[indptr[i]:indptr[i + 1]], with travel times
+    in the same slice of weights. Each road also appears once in the edge_*
+    arrays, in the same order as get_edge_list.
+    
+    Travel times are float32: exact for the editor's whole minutes, while still
+    accepting any weight update_traffic_weight is given.
+    """
+    nodes: List[str]
+    node_to_idx: Dict[str, int]
+    indptr: np.ndarray
+    indices: np.ndarray
+    weights: np.ndarray
+    edge_src: np.ndarray
+    edge_dst: np.ndarray
+    edge_weights: np.ndarray
+
+
 def get_road_network():
     """
     Returns a predefined road network as a weighted adjacency list graph.
@@ -90,37 +117,120 @@ def get_road_network():
     return road_network
 
 
-def get_locations():
+def get_locations(road_network=None):
     """
     Returns a sorted list of all available locations in the network.
     Used for populating dropdown menus in the UI.
+    
+    Args:
+        road_network: Road network to read from (defaults to the predefined network)
     """
-    road_network = get_road_network()
+    if road_network is None:
+        road_network = get_road_network()
     locations = sorted(list(road_network.keys()))
     return locations
 
 
-def get_edge_list():
+def build_csr(road_network):
+    """
+    Converts the road network adjacency list into a CSR representation.
+    
+    Args:
+        road_network: The road network dictionary
+    
+    Returns:
+        RoadNetworkCSR with int32 indices and float32 weights
+    """
+    nodes = list(road_network.keys())
+    node_to_idx = {node: idx for idx, node in enumerate(nodes)}
+    n = len(nodes)
+    
+    degrees = np.fromiter((len(neighbors) for neighbors in road_network.values()), dtype=np.int32, count=n)
+    indptr = np.zeros(n + 1, dtype=np.int32)
+    np.cumsum(degrees, out=indptr[1:])
+    nnz = int(indptr[-1])
+    
+    indices = np.fromiter(
+        (node_to_idx[destination] for neighbors in road_network.values() for destination in neighbors),
+        dtype=np.int32, count=nnz
+    )
+    weights = np.fromiter(
+        (weight for neighbors in road_network.values() for weight in neighbors.values()),
+        dtype=np.float32, count=nnz
+    )
+    
+    # Keep one copy of each road: the direction seen first (lower source index),
+    # the only direction for one-way roads, or self-loops (their own reverse)
+    rows = np.repeat(np.arange(n, dtype=np.int32), degrees)
+    has_reverse = np.isin(indices.astype(np.int64) * n + rows, rows.astype(np.int64) * n + indices)
+    keep = (rows <= indices) | ~has_reverse
+    
+    return RoadNetworkCSR(
+        nodes=nodes,
+        node_to_idx=node_to_idx,
+        indptr=indptr,
+        indices=indices,
+        weights=weights,
+        edge_src=rows[keep],
+        edge_dst=indices[keep],
+        edge_weights=weights[keep]
+    )
+
+
+def edge_list_from_csr(network_csr):
+    """
+    Returns all edges of a RoadNetworkCSR as a list of tuples.
+    Format: [(source, destination, weight), ...]
+    """
+    nodes = network_csr.nodes
+    return [
+        (nodes[src], nodes[dst], weight)
+        for src, dst, weight in zip(
+            network_csr.edge_src.tolist(),
+            network_csr.edge_dst.tolist(),
+            network_csr.edge_weights.tolist()
+        )
+    ]
+
+
+def get_edge_list(road_network=None):
     """
     Returns all edges in the graph as a list of tuples.
     Format: [(source, destination, weight), ...]
     Useful for visualization purposes.
+    
+    Args:
+        road_network: Road network to read from (defaults to the predefined network)
     """
-    road_network = get_road_network()
-    edges = []
+    if road_network is None:
+        road_network = get_road_network()
     
-    # Avoid duplicates by tracking processed edges
-    processed = set()
+    return edge_list_from_csr(build_csr(road_network))
+
+
+def network_fingerprint(road_network):
+    """
+    Returns a short content fingerprint of the road network.
+    Used as the cache hash for the road network, so cached results follow
+    traffic updates without a manual invalidation key.
     
-    for source, neighbors in road_network.items():
-        for destination, weight in neighbors.items():
-            # Create a normalized edge identifier (bidirectional)
-            edge_id = tuple(sorted([source, destination]))
-            if edge_id not in processed:
-                edges.append((source, destination, weight))
-                processed.add(edge_id)
+    Args:
+        road_network: The road network dictionary
+    
+    Returns:
+        Hex digest covering the locations, their connections and the weights
+    """
+    topology = "\n".join(
+        f"{source}\t" + "\t".join(neighbors) for source, neighbors in road_network.items()
+    )
+    weights = np.fromiter(
+        (weight for neighbors in road_network.values() for weight in neighbors.values()),
+        dtype=np.float64
+    )
     
-    return edges
+    digest = hashlib.blake2b(topology.encode(), digest_size=8)
+    digest.update(weights.tobytes())
+    return digest.hexdigest()
 
 
 def update_traffic_weight(road_network, source, destination, new_weight):
@@ -0,0 +1,64 @@
+"""
+test_network_csr.py
+Purpose: Checks the CSR representation of the road network against the original
+dict-based edge list and Dijkstra implementation.
+"""
+
+import pytest
+
+from data_loader import get_road_network, get_edge_list, build_csr
+from utils import dijkstra_shortest_path, all_pairs_dijkstra, lookup_route
+
+
+NETWORKS = {
+    'default': get_road_network(),
+    # A -> B and C -> A are one-way, D is unreachable
+    'one_way': {'A': {'B': 2}, 'B': {'C': 4}, 'C': {'A': 1, 'B': 4}, 'D': {}},
+    'self_loop': {'A': {'A': 3, 'B': 1}, 'B': {'A': 1}},
+}
+
+
+def dict_edge_list(road_network):
+    """Edge list built the original way: first occurrence of each unordered pair."""
+    edges = []
+    processed = set()
+    
+    for source, neighbors in road_network.items():
+        for destination, weight in neighbors.items():
+            edge_id = tuple(sorted([source, destination]))
+            if edge_id not in processed:
+                edges.append((source, destination, weight))
+                processed.add(edge_id)
+    
+    return edges
+
+
+@pytest.mark.parametrize('name', NETWORKS)
+def test_edge_list_matches_dict_version(name):
+    road_network = NETWORKS[name]
+    assert get_edge_list(road_network) == dict_edge_list(road_network)
+
+
+def test_edge_list_keeps_self_loops():
+    assert get_edge_list(NETWORKS['self_loop']) == [('A', 'A', 3), ('A', 'B', 1)]
+
+
+@pytest.mark.parametrize('name', NETWORKS)
+def test_route_matches_dijkstra_shortest_path(name):
+    road_network = NETWORKS[name]
+    network_csr = build_csr(road_network)
+    dist_matrix, pred_matrix = all_pairs_dijkstra(network_csr)
+    
+    for source in road_network:
+        for destination in road_network:
+            expected_path, expected_distance = dijkstra_shortest_path(road_network, source, destination)
+            path, path_edges, distance = lookup_route(
+                network_csr, dist_matrix, pred_matrix,
+                network_csr.node_to_idx[source],
+                network_csr.node_to_idx[destination]
+            )
+            
+            assert path == expected_path
+            assert distance == expected_distance
+            if path is not None:
+                assert path_edges == list(zip(path[:-1], path[1:]))
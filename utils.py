@@ -6,6 +6,10 @@ This module handles all pathfinding logic for the traffic predictor.
 
 import heapq
 
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import dijkstra
+
 
 def dijkstra_shortest_path(graph, start, end):
     """
@@ -94,6 +98,75 @@ def dijkstra_shortest_path(graph, start, end):
     return path, distances[end]
 
 
+def _to_scipy_csr(network_csr):
+    """Wraps the RoadNetworkCSR arrays in a SciPy sparse matrix (no copy)."""
+    n = len(network_csr.nodes)
+    return csr_matrix((network_csr.weights, network_csr.indices, network_csr.indptr), shape=(n, n))
+
+
+def _reconstruct_route(network_csr, distances, predecessors, dst_idx):
+    """
+    Rebuilds the route to dst_idx from a single-source distances/predecessors pair.
+    
+    Returns:
+        tuple: (path as list of locations, path as list of edges, total weight/distance)
+               Returns (None, None, None) if no path exists
+    """
+    # Check if destination is reachable
+    if np.isinf(distances[dst_idx]):
+        return None, None, None
+    
+    # Walk the predecessor array back from the destination, collecting
+    # both the locations and the edges between them in a single pass
+    idx_to_node = network_csr.nodes
+    current = idx_to_node[dst_idx]
+    path = [current]
+    path_edges = []
+    pred = predecessors[dst_idx]
+    while pred >= 0:
+        previous = idx_to_node[pred]
+        path.append(previous)
+        path_edges.append((previous, current))
+        current = previous
+        pred = predecessors[pred]
+    
+    path.reverse()
+    path_edges.reverse()
+    
+    return path, path_edges, float(distances[dst_idx])
+
+
+def all_pairs_dijkstra(network_csr):
+    """
+    Computes shortest paths between every pair of locations in one SciPy call.
+    
+    Args:
+        network_csr: RoadNetworkCSR of the road network (see data_loader.build_csr)
+    
+    Returns:
+        tuple: (distance matrix, predecessor matrix), both indexed [source, destination]
+    """
+    return dijkstra(_to_scipy_csr(network_csr), return_predecessors=True)
+
+
+def lookup_route(network_csr, dist_matrix, pred_matrix, src_idx, dst_idx):
+    """
+    Reads a route out of precomputed all-pairs results (see all_pairs_dijkstra).
+    
+    Args:
+        network_csr: RoadNetworkCSR the matrices were computed from
+        dist_matrix: All-pairs distance matrix
+        pred_matrix: All-pairs predecessor matrix
+        src_idx: Index of the starting location
+        dst_idx: Index of the destination
+    
+    Returns:
+        tuple: (path as list of locations, path as list of edges, total weight/distance)
+               Returns (None, None, None) if no path exists
+    """
+    return _reconstruct_route(network_csr, dist_matrix[src_idx], pred_matrix[src_idx], dst_idx)
+
+
 def get_path_edges(path):
     """
     Converts a path (list of nodes) into a list of edges.